@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-from calendar import monthrange
-from datetime import date, datetime, time
+import re
+from bisect import bisect_left
+from datetime import date, datetime
 from datetime import timedelta as td
-from datetime import timezone
+from datetime import timezone, tzinfo
 from enum import IntEnum
+from functools import lru_cache
+from heapq import heappop, heappush
+from typing import Callable, Iterable, NamedTuple
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 UTC = timezone.utc
@@ -20,6 +24,13 @@ RANGES = [
     range(0, 60),
     range(0, 60),
 ]
+# Full sets of values for every field. These are used for "*" fields and for
+# fields omitted from the expression. They are frozen so they can be shared
+# between iterators.
+FULL_SETS = tuple(frozenset(r) for r in RANGES)
+# Shared single-value sets for the values that come up in most expressions:
+# reverse days, weekdays, months, days, hours, minutes, and seconds.
+SINGLETONS = {v: frozenset({v}) for v in range(-31, 60)}
 SYMBOLIC_DAYS = "MONDAY TUESDAY WEDNESDAY THURSDAY FRIDAY SATURDAY SUNDAY".split()
 SYMBOLIC_DAYS_SHORT = [s[:3] for s in SYMBOLIC_DAYS]
 DAYS_IN_MONTH = [-1, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
@@ -43,11 +54,24 @@ SPECIALS = {
     "quarterly": "*-01,04,07,10-01 00:00:00",
     "semiannually": "*-01,07-01 00:00:00",
 }
+# Matches the syntax of tz database timezone names, for example "UTC",
+# "Europe/Riga", "America/Argentina/Buenos_Aires", "Etc/GMT+5".
+TZ_NAME_RE = re.compile(r"[A-Za-z][A-Za-z0-9_+\-]*(?:/[A-Za-z0-9_+\-]+)*")
 # timedelta initialization is not cheap so we prepare a few constants
 # that we will need often:
 SECOND = td(seconds=1)
 MINUTE = td(minutes=1)
 HOUR = td(hours=1)
+DAY = td(days=1)
+# The largest number of matching times of day to list in a sorted tuple
+# for BaseIterator.advance_time. Expressions with more matching times
+# of day advance the hour, minute and second fields separately.
+MAX_TIMES_OF_DAY = 3600
+# The interval, in days, at which dst_gaps probes UTC offsets. Since 1970,
+# the shortest interval between two DST transitions in the tz database
+# is 7 days (America/Boa_Vista, America/Noronha and America/Recife in 2000).
+# Custom tzinfo implementations with closer transitions are not supported.
+DST_PROBE_DAYS = 6
 
 
 class OnCalendarError(Exception):
@@ -67,13 +91,11 @@ class Field(IntEnum):
         return "Bad %s" % FIELD_NAMES[self]
 
     def _int(self, value: str) -> int:
-        if value == "":
+        # Make sure the value is not empty and contains ASCII digits and nothing
+        # else (for example, we reject integer literals with underscores,
+        # and non-ASCII digits that int() would otherwise accept)
+        if not value.isascii() or not value.isdigit():
             raise OnCalendarError(self.msg())
-        # Make sure the value contains digits and nothing else
-        # (for example, we reject integer literals with underscores)
-        for ch in value:
-            if ch not in "0123456789":
-                raise OnCalendarError(self.msg())
 
         return int(value)
 
@@ -112,18 +134,20 @@ class Field(IntEnum):
 
         return v
 
-    def parse(self, s: str, reverse: bool = False) -> set[__builtins__.int]:
+    def parse(
+        self, s: str, reverse: bool = False
+    ) -> set[__builtins__.int] | frozenset[__builtins__.int]:
         """Parse a single component of an expression into a set of integers.
 
-        To handle lists, intervals, and intervals with a step, this function
-        recursively calls itself.
+        This function handles the syntax that applies to the component as a whole,
+        and then parses each of its comma-delimited terms with `parse_term`.
         """
         if self == Field.DAY and s.startswith("~"):
             # Chop leading "~" and set the reverse flag
             return self.parse(s[1:], reverse=True)
 
         if self != Field.DOW and s == "*":
-            return set(RANGES[self])
+            return FULL_SETS[self]
 
         if "*" in s:
             # systemd's OnCalendar syntax does not allow '*' to appear in
@@ -141,23 +165,29 @@ class Field(IntEnum):
             return self.parse(s.replace("-", ".."))
 
         if "," in s:
-            result = set()
+            # Accumulate all terms of the list into a single set
+            result: set[__builtins__.int] = set()
             for term in s.split(","):
-                result.update(self.parse(term, reverse=reverse))
+                result.update(self.parse_term(term, reverse))
             return result
 
+        return self.parse_term(s, reverse)
+
+    def parse_term(
+        self, s: str, reverse: bool
+    ) -> set[__builtins__.int] | frozenset[__builtins__.int]:
+        """Parse a single value, an interval, or an interval with a step."""
         if "/" in s and self != Field.DOW:
             term, step_str = s.split("/", maxsplit=1)
             step = self._int(step_str)
             if step == 0:
                 raise OnCalendarError(self.msg())
 
-            items = self.parse(term, reverse=reverse)
+            items = self.parse_term(term, reverse)
 
             if len(items) == 1:
-                start = items.pop()
-                assert isinstance(start, int)
-                end = 0 if reverse else max(RANGES[self])
+                start = min(items)
+                end = 0 if reverse else RANGES[self][-1]
                 tail = range(start, end + 1)
                 return set(tail[::step])
 
@@ -185,14 +215,380 @@ class Field(IntEnum):
                 raise OnCalendarError(self.msg())
             v = -v
 
+        if v in SINGLETONS:
+            return SINGLETONS[v]
+
         return {v}
 
 
+def days_in_month(year: int, month: int) -> int:
+    """Return the number of days in the given month."""
+    # DAYS_IN_MONTH lists 29 days for February, correct it for non-leap years
+    if month == 2 and (year % 4 or (year % 100 == 0 and year % 400)):
+        return 28
+    return DAYS_IN_MONTH[month]
+
+
+@lru_cache(maxsize=256)
+def parse_field(field: Field, s: str) -> frozenset[int]:
+    """Parse a single component of an expression into a frozenset of integers.
+
+    The results are cached, so iterators built from expressions with identical
+    components share the same frozensets.
+    """
+    return frozenset(field.parse(s))
+
+
+class ParsedExpression(NamedTuple):
+    """Sets of matching values for every field of an OnCalendar expression."""
+
+    weekdays: frozenset[int]
+    years: frozenset[int]
+    months: frozenset[int]
+    days: frozenset[int]
+    hours: frozenset[int]
+    minutes: frozenset[int]
+    seconds: frozenset[int]
+
+
+def parse_expression(expression: str) -> ParsedExpression:
+    """Parse an OnCalendar expression (without a timezone) into sets of integers."""
+    expression = SPECIALS.get(expression.lower(), expression)
+
+    parts = expression.replace("~", "-~").split()
+    if not parts:
+        raise OnCalendarError("Wrong number of fields")
+
+    if ":" in parts[-1]:
+        time_parts = parts.pop().split(":")
+        if len(time_parts) not in (2, 3):
+            raise OnCalendarError("Bad time")
+        if len(time_parts) == 2:
+            # If seconds is missing, use default
+            time_parts.append("0")
+        hours = parse_field(Field.HOUR, time_parts[0])
+        minutes = parse_field(Field.MINUTE, time_parts[1])
+        seconds = parse_field(Field.SECOND, time_parts[2])
+    else:
+        # Default: 00:00:00
+        hours = minutes = seconds = SINGLETONS[0]
+
+    if parts and "-" in parts[-1] and parts[-1][0] in "0123456789*":
+        date_parts = parts.pop().split("-")
+        if len(date_parts) not in (2, 3):
+            raise OnCalendarError("Bad date")
+        if len(date_parts) == 2:
+            # If year is missing, use default
+            date_parts.insert(0, "*")
+        years = parse_field(Field.YEAR, date_parts[0])
+        months = parse_field(Field.MONTH, date_parts[1])
+        days = parse_field(Field.DAY, date_parts[2])
+    else:
+        # Default: *-*-*
+        years = FULL_SETS[Field.YEAR]
+        months = FULL_SETS[Field.MONTH]
+        days = FULL_SETS[Field.DAY]
+
+    if parts:
+        weekdays = parse_field(Field.DOW, parts.pop(0))
+    else:
+        # Default: Mon..Sun
+        weekdays = FULL_SETS[Field.DOW]
+
+    # There should be no parts left over
+    if parts:
+        raise OnCalendarError("Wrong number of fields")
+
+    return ParsedExpression(weekdays, years, months, days, hours, minutes, seconds)
+
+
+def to_mask(values: Iterable[int]) -> int:
+    """Return an integer bitmask with a bit set for every value in `values`."""
+    mask = 0
+    for v in values:
+        mask |= 1 << v
+    return mask
+
+
+def to_next_table(mask: int, size: int) -> tuple[int, ...]:
+    """Return a lookup table of distances to the next matching value.
+
+    For every `i` in `0 .. size-1` the table contains the distance from `i`
+    to the smallest bit set in `mask` that is greater or equal to `i`.
+    If there is no such value, the table contains the distance from `i` to `size`
+    (the point where the field wraps around and the next higher field increments).
+    """
+    table = [0] * size
+    distance = 0
+    for i in reversed(range(size)):
+        distance = 0 if (mask >> i) & 1 else distance + 1
+        table[i] = distance
+    return tuple(table)
+
+
+def to_period(values: frozenset[int], size: int) -> int | None:
+    """Return the interval at which `values` repeat, or None if they don't.
+
+    Return `p` if `values` contain every p-th value of a field with `size`
+    possible values, so that the distance between consecutive values,
+    including the wrap-around, is always `p`. A single value has
+    the period of `size`.
+    """
+    period, remainder = divmod(size, len(values))
+    if remainder:
+        return None
+
+    if values != set(range(min(values), size, period)):
+        return None
+
+    return period
+
+
+def get_fixed_step(parsed: ParsedExpression) -> td | None:
+    """Return the interval between matches if it is constant, or None."""
+
+    if parsed.years != FULL_SETS[Field.YEAR]:
+        return None
+    if parsed.months != FULL_SETS[Field.MONTH]:
+        return None
+    if parsed.days != FULL_SETS[Field.DAY]:
+        return None
+
+    hour_period = to_period(parsed.hours, 24)
+    minute_period = to_period(parsed.minutes, 60)
+    second_period = to_period(parsed.seconds, 60)
+    if hour_period is None or minute_period is None or second_period is None:
+        return None
+
+    if second_period < 60:
+        # Multiple matches per minute: every minute and hour must match
+        if minute_period != 1 or hour_period != 1:
+            return None
+        step = td(seconds=second_period)
+    elif minute_period < 60:
+        # Multiple matches per hour: every hour must match
+        if hour_period != 1:
+            return None
+        step = td(minutes=minute_period)
+    elif hour_period < 24:
+        step = td(hours=hour_period)
+    elif len(parsed.weekdays) == 1:
+        # A single match per week
+        return td(days=7)
+    else:
+        step = td(days=1)
+
+    # Intervals shorter than a week require every weekday to match
+    if parsed.weekdays != FULL_SETS[Field.DOW]:
+        return None
+
+    return step
+
+
+class Schedule(NamedTuple):
+    """Lookup data the iterators use to find the matches of an expression."""
+
+    parsed: ParsedExpression
+    weekdays_mask: int
+    days_pos_mask: int
+    days_by_length: tuple[tuple[int, ...], ...]
+    months_mask: int
+    months_sorted: tuple[int, ...]
+    years_sorted: tuple[int, ...]
+    next_hour: tuple[int, ...]
+    next_minute: tuple[int, ...]
+    next_second: tuple[int, ...]
+    fixed_step: td | None
+    times_of_day: tuple[int, ...]
+    step_names: tuple[str, ...]
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(expression: str) -> Schedule:
+    """Parse an OnCalendar expression and precompute its lookup data.
+
+    The results are cached, so constructing many iterators with the same
+    expression and different start times only does this work once.
+    """
+    parsed = parse_expression(expression)
+
+    # Bitmasks for quick membership checks, sorted tuples of years and months,
+    # and lookup tables for jumping straight to the next matching second,
+    # minute, and hour.
+    weekdays_mask = to_mask(parsed.weekdays)
+    days_pos_mask = to_mask(d for d in parsed.days if d > 0)
+    # Reverse days are stored as negative numbers, -1 being the last day
+    # of the month. In the mask, bit 1 stands for the last day of the month.
+    days_neg_mask = to_mask(-d for d in parsed.days if d < 0)
+    # For every possible month length, a sorted tuple of the matching days.
+    # Indexed by the month length minus 28. Schedules are shared between
+    # iterators, so this is a tuple rather than a mutable dict.
+    days_by_length = tuple(
+        tuple(
+            d
+            for d in range(1, last + 1)
+            if (days_pos_mask >> d) & 1 or (days_neg_mask >> (last - d + 1)) & 1
+        )
+        for last in (28, 29, 30, 31)
+    )
+    # Leave out months that cannot contain any of the matching days
+    # (for example, April, June, September and November for "*-*-31").
+    # DAYS_IN_MONTH lists 29 days for February, leap years count too.
+    months_sorted = tuple(
+        m for m in sorted(parsed.months) if days_by_length[DAYS_IN_MONTH[m] - 28]
+    )
+    months_mask = to_mask(months_sorted)
+    # If no month can contain a matching day (for example, "*-02-30"),
+    # then no year can contain a match either.
+    years_sorted = tuple(sorted(parsed.years)) if months_mask else ()
+
+    # The advance steps __next__ needs to run for this expression, from the
+    # largest field to the smallest. Fields that match every possible
+    # value can never require advancing, so their steps are left out.
+    step_names = []
+    if months_mask != to_mask(FULL_SETS[Field.MONTH]):
+        step_names.append("advance_month")
+    if parsed.days != FULL_SETS[Field.DAY] or parsed.weekdays != FULL_SETS[Field.DOW]:
+        step_names.append("advance_day")
+
+    times_of_day: tuple[int, ...] = ()
+    num_times = len(parsed.hours) * len(parsed.minutes) * len(parsed.seconds)
+    if num_times == 86400:
+        # Every second of the day matches, no time steps needed
+        pass
+    elif num_times <= MAX_TIMES_OF_DAY:
+        # Few enough matching times of day to list them all, and handle
+        # hours, minutes and seconds in a single step
+        times_of_day = tuple(
+            sorted(
+                h * 3600 + m * 60 + s
+                for h in parsed.hours
+                for m in parsed.minutes
+                for s in parsed.seconds
+            )
+        )
+        step_names.append("advance_time")
+    else:
+        if parsed.hours != FULL_SETS[Field.HOUR]:
+            step_names.append("advance_hour")
+        if parsed.minutes != FULL_SETS[Field.MINUTE]:
+            step_names.append("advance_minute")
+        if parsed.seconds != FULL_SETS[Field.SECOND]:
+            step_names.append("advance_second")
+
+    return Schedule(
+        parsed,
+        weekdays_mask,
+        days_pos_mask,
+        days_by_length,
+        months_mask,
+        months_sorted,
+        years_sorted,
+        to_next_table(to_mask(parsed.hours), 24),
+        to_next_table(to_mask(parsed.minutes), 60),
+        to_next_table(to_mask(parsed.seconds), 60),
+        get_fixed_step(parsed),
+        times_of_day,
+        tuple(step_names),
+    )
+
+
+def localize(dt: datetime, tz: tzinfo) -> datetime:
+    """Return the naive datetime `dt` with `tz` attached and fold set to 0.
+
+    This is equivalent to `dt.replace(tzinfo=tz, fold=0)`, but the datetime
+    constructor with positional arguments is several times faster than replace().
+    """
+    return datetime(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second, 0, tz)
+
+
 def is_imaginary(dt: datetime) -> bool:
     """Return True if dt gets skipped over during DST transition."""
     return dt != dt.astimezone(UTC).astimezone(dt.tzinfo)
 
 
+def utc_offset(tz: tzinfo, timestamp: int) -> td:
+    """Return the UTC offset of `tz` at the POSIX timestamp `timestamp`."""
+    offset = datetime.fromtimestamp(timestamp, tz).utcoffset()
+    assert offset is not None
+    return offset
+
+
+@lru_cache(maxsize=1024)
+def dst_gaps(tz: tzinfo, year: int) -> tuple[tuple[datetime, datetime], ...]:
+    """Return the wall clock times skipped over during DST transitions in `year`.
+
+    Return a sorted tuple of (start, end) pairs of naive datetimes. The wall
+    clock times from `start` (inclusive) to `end` (exclusive) do not exist
+    in `tz`, and some of them fall in `year`. A gap that spans the new year
+    is returned for both years.
+
+    This probes the UTC offset every DST_PROBE_DAYS days, and then bisects
+    to the exact second of every transition. It assumes a timezone never
+    changes its UTC offset twice between two probes. This holds for the
+    tz database, but is only a heuristic for custom tzinfo implementations.
+    """
+    if isinstance(tz, timezone):
+        # Fixed-offset timezones have no DST transitions
+        return ()
+
+    gaps = []
+    # Probe a few extra days around the year, the UTC offset can move
+    # wall clock times across the year boundary in both directions.
+    # Work with integer timestamps, but do not go before the epoch:
+    # fromtimestamp() does not support negative timestamps on all platforms.
+    probe = max(int(datetime(year, 1, 1, tzinfo=UTC).timestamp()) - 2 * 86400, 0)
+    end = int(datetime(year + 1, 1, 1, tzinfo=UTC).timestamp()) + 2 * 86400
+    step = DST_PROBE_DAYS * 86400
+    new_year = datetime(year, 1, 1)
+    offset = utc_offset(tz, probe)
+    while probe < end:
+        next_probe = probe + step
+        next_offset = utc_offset(tz, next_probe)
+        if next_offset != offset:
+            # Find the first second with the new offset
+            lo, hi = probe, next_probe
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if utc_offset(tz, mid) == offset:
+                    lo = mid
+                else:
+                    hi = mid
+            transition = datetime.fromtimestamp(hi, UTC).replace(tzinfo=None)
+            # Clocks move forward when the offset increases, and the wall clock
+            # times between the old and the new offset get skipped
+            start, stop = transition + offset, transition + next_offset
+            if next_offset > offset and start.year <= year and stop > new_year:
+                gaps.append((start, stop))
+
+        probe, offset = next_probe, next_offset
+
+    return tuple(gaps)
+
+
+def next_dst_gap(tz: tzinfo, dt: datetime) -> tuple[datetime, datetime]:
+    """Return the first DST gap in `tz` that ends after the naive datetime `dt`.
+
+    If there are no such gaps in the year of `dt`, return an empty gap at the
+    start of the next year.
+    """
+    for gap in dst_gaps(tz, dt.year):
+        if gap[1] > dt:
+            return gap
+
+    next_year = datetime(dt.year + 1, 1, 1)
+    return next_year, next_year
+
+
+class Advance(NamedTuple):
+    """The result of rolling a datetime forward in one of the advance_* methods."""
+
+    dt: datetime
+    # True if the rolled forward datetime is in a different larger unit (for
+    # example, advance_second moved past the end of the current minute)
+    carry: bool
+
+
 class BaseIterator(object):
     """OnCalendar expression parser and iterator.
 
@@ -212,6 +608,33 @@ class BaseIterator(object):
       then the same datetime but with the post-transition timezone.
     """
 
+    __slots__ = (
+        "dt",
+        "weekdays",
+        "years",
+        "months",
+        "days",
+        "hours",
+        "minutes",
+        "seconds",
+        "weekdays_mask",
+        "days_pos_mask",
+        "days_by_length",
+        "months_mask",
+        "months_sorted",
+        "years_sorted",
+        "next_hour",
+        "next_minute",
+        "next_second",
+        "fixed_step",
+        "times_of_day",
+        "fixup_tz",
+        "gap",
+        "matched",
+        "steps",
+        "__weakref__",
+    )
+
     def __init__(self, expression: str, start: datetime):
         """Initialize the iterator with an OnCalendar expression and the start time.
 
@@ -227,52 +650,26 @@ class BaseIterator(object):
         """
         self.dt = start.replace(microsecond=0)
 
-        if expression.lower() in SPECIALS:
-            expression = SPECIALS[expression.lower()]
-
-        parts = expression.replace("~", "-~").split()
-        if not parts:
-            raise OnCalendarError("Wrong number of fields")
-
-        if ":" in parts[-1]:
-            time_parts = parts.pop().split(":")
-            if len(time_parts) not in (2, 3):
-                raise OnCalendarError("Bad time")
-            if len(time_parts) == 2:
-                # If seconds is missing, use default
-                time_parts.append("0")
-            self.hours = Field.HOUR.parse(time_parts[0])
-            self.minutes = Field.MINUTE.parse(time_parts[1])
-            self.seconds = Field.SECOND.parse(time_parts[2])
-        else:
-            # Default: 00:00:00
-            self.hours, self.minutes, self.seconds = {0}, {0}, {0}
-
-        if parts and "-" in parts[-1] and parts[-1][0] in "0123456789*":
-            date_parts = parts.pop().split("-")
-            if len(date_parts) not in (2, 3):
-                raise OnCalendarError("Bad date")
-            if len(date_parts) == 2:
-                # If year is missing, use default
-                date_parts.insert(0, "*")
-            self.years = Field.YEAR.parse(date_parts[0])
-            self.months = Field.MONTH.parse(date_parts[1])
-            self.days = Field.DAY.parse(date_parts[2])
-        else:
-            # Default: *-*-*
-            self.years = set(RANGES[Field.YEAR])
-            self.months = set(RANGES[Field.MONTH])
-            self.days = set(RANGES[Field.DAY])
-
-        if parts:
-            self.weekdays = Field.DOW.parse(parts.pop(0))
-        else:
-            # Default: Mon..Sun
-            self.weekdays = set(RANGES[Field.DOW])
-
-        # There should be no parts left over
-        if parts:
-            raise OnCalendarError("Wrong number of fields")
+        schedule = compile_expression(expression)
+        parsed = schedule.parsed
+        self.weekdays = parsed.weekdays
+        self.years = parsed.years
+        self.months = parsed.months
+        self.days = parsed.days
+        self.hours = parsed.hours
+        self.minutes = parsed.minutes
+        self.seconds = parsed.seconds
+        self.weekdays_mask = schedule.weekdays_mask
+        self.days_pos_mask = schedule.days_pos_mask
+        self.days_by_length = schedule.days_by_length
+        self.months_mask = schedule.months_mask
+        self.months_sorted = schedule.months_sorted
+        self.years_sorted = schedule.years_sorted
+        self.next_hour = schedule.next_hour
+        self.next_minute = schedule.next_minute
+        self.next_second = schedule.next_second
+        self.fixed_step = schedule.fixed_step
+        self.times_of_day = schedule.times_of_day
 
         self.fixup_tz = None
         if self.dt.tzinfo in (None, UTC):
@@ -282,193 +679,325 @@ class BaseIterator(object):
             self.fixup_tz = self.dt.tzinfo
             self.dt = self.dt.replace(tzinfo=None)
 
-        self.any_reverse_day = any(d < 0 for d in self.days)
+        # The next known DST gap in fixup_tz as a (start, end) pair of naive
+        # datetimes, see is_imaginary(). There are no gaps between the current
+        # position and the start of this gap.
+        self.gap = (datetime.min, datetime.min)
 
-    def advance_second(self) -> bool:
-        """Roll forward the second component until it satisfies the constraints.
+        # If the expression matches at a fixed interval (for example, "hourly",
+        # "daily", "weekly", "*:0/15"), then fixed_step is set, and, after
+        # the first match, __next__ skips the field checks and adds
+        # the interval directly.
+        self.matched = False
+
+        cls = type(self)
+        self.steps: list[Callable[[BaseIterator, datetime], Advance | None]] = [
+            getattr(cls, name) for name in schedule.step_names
+        ]
+
+    def advance_time(self, dt: datetime) -> Advance | None:
+        """Roll forward the time of day until it satisfies the constraints.
+
+        This method handles the hour, minute and second components at once,
+        and is used instead of advance_hour, advance_minute and
+        advance_second when the expression has few matching times of day.
 
-        Return False if the second meets contraints without modification.
-        Return True if self.dt was rolled forward.
+        Return None if the time meets contraints without modification.
+        Return the rolled forward datetime and the carry flag otherwise.
 
         """
 
-        if self.dt.second in self.seconds:
-            return False
+        tod = dt.hour * 3600 + dt.minute * 60 + dt.second
+        idx = bisect_left(self.times_of_day, tod)
+        if idx < len(self.times_of_day):
+            candidate = self.times_of_day[idx]
+            if candidate == tod:
+                return None
+
+            hour, rest = divmod(candidate, 3600)
+            minute, second = divmod(rest, 60)
+            moved = datetime(
+                dt.year, dt.month, dt.day, hour, minute, second, 0, dt.tzinfo
+            )
+            return Advance(moved, False)
+
+        # No matching times left in the current day, move to the start of
+        # the next day
+        midnight = datetime(dt.year, dt.month, dt.day, 0, 0, 0, 0, dt.tzinfo)
+        return Advance(midnight + DAY, True)
+
+    def advance_second(self, dt: datetime) -> Advance | None:
+        """Roll forward the second component until it satisfies the constraints.
+
+        Return None if the second meets contraints without modification.
+        Return the rolled forward datetime and the carry flag otherwise.
+
+        """
 
-        if len(self.seconds) == 1:
-            # An optimization for the special case where self.seconds has exactly
-            # one element. Instead of advancing one second per iteration,
-            # make a jump from the current second to the target second.
-            delta = (next(iter(self.seconds)) - self.dt.second) % 60
-            self.dt += td(seconds=delta)
+        delta = self.next_second[dt.second]
+        if delta == 0:
+            return None
 
-        while self.dt.second not in self.seconds:
-            self.dt += SECOND
-            if self.dt.second == 0:
-                # Break out to re-check year, month, day, hour, and minute
-                break
+        second = dt.second + delta
+        if second < 60:
+            moved = datetime(
+                dt.year, dt.month, dt.day, dt.hour, dt.minute, second, 0, dt.tzinfo
+            )
+            return Advance(moved, False)
 
-        return True
+        # No matching seconds left in the current minute, move to the start
+        # of the next minute
+        start = datetime(dt.year, dt.month, dt.day, dt.hour, dt.minute, 0, 0, dt.tzinfo)
+        return Advance(start + MINUTE, True)
 
-    def advance_minute(self) -> bool:
+    def advance_minute(self, dt: datetime) -> Advance | None:
         """Roll forward the minute component until it satisfies the constraints.
 
-        Return False if the minute meets contraints without modification.
-        Return True if self.dt was rolled forward.
+        Return None if the minute meets contraints without modification.
+        Return the rolled forward datetime and the carry flag otherwise.
 
         """
 
-        if self.dt.minute in self.minutes:
-            return False
+        delta = self.next_minute[dt.minute]
+        if delta == 0:
+            return None
 
-        self.dt = self.dt.replace(second=0)
-        while self.dt.minute not in self.minutes:
-            self.dt += MINUTE
-            if self.dt.minute == 0:
-                # Break out to re-check year, month, day and hour
-                break
+        minute = dt.minute + delta
+        if minute < 60:
+            moved = datetime(
+                dt.year, dt.month, dt.day, dt.hour, minute, 0, 0, dt.tzinfo
+            )
+            return Advance(moved, False)
 
-        return True
+        # No matching minutes left in the current hour, move to the start
+        # of the next hour
+        start = datetime(dt.year, dt.month, dt.day, dt.hour, 0, 0, 0, dt.tzinfo)
+        return Advance(start + HOUR, True)
 
-    def advance_hour(self) -> bool:
+    def advance_hour(self, dt: datetime) -> Advance | None:
         """Roll forward the hour component until it satisfies the constraints.
 
-        Return False if the hour meets contraints without modification.
-        Return True if self.dt was rolled forward.
+        Return None if the hour meets contraints without modification.
+        Return the rolled forward datetime and the carry flag otherwise.
 
         """
 
-        if self.dt.hour in self.hours:
-            return False
+        delta = self.next_hour[dt.hour]
+        if delta == 0:
+            return None
+
+        hour = dt.hour + delta
+        if hour < 24:
+            moved = datetime(dt.year, dt.month, dt.day, hour, 0, 0, 0, dt.tzinfo)
+            return Advance(moved, False)
 
-        self.dt = self.dt.replace(minute=0, second=0)
-        while self.dt.hour not in self.hours:
-            self.dt += HOUR
-            if self.dt.hour == 0:
-                # break out to re-check year, month and day
-                break
+        # No matching hours left in the current day, move to the start
+        # of the next day
+        start = datetime(dt.year, dt.month, dt.day, 0, 0, 0, 0, dt.tzinfo)
+        return Advance(start + DAY, True)
 
-        return True
+    @property
+    def any_reverse_day(self) -> bool:
+        """True if the expression uses the <month>~<day> syntax."""
+        return any(d < 0 for d in self.days)
 
     def match_dom(self, d: date) -> bool:
         """Return True is day-of-month matches."""
-        if d.day in self.days:
-            return True
-
-        if self.any_reverse_day:
-            _, last = monthrange(d.year, d.month)
-            if d.day - last - 1 in self.days:
-                return True
-
-        return False
+        return d.day in self.days_by_length[days_in_month(d.year, d.month) - 28]
 
     def match_dow(self, d: date) -> bool:
         """Return True is day-of-week matches."""
+        return bool((self.weekdays_mask >> d.weekday()) & 1)
 
-        return d.weekday() in self.weekdays
-
-    def advance_day(self) -> bool:
+    def advance_day(self, dt: datetime) -> Advance | None:
         """Roll forward the day component until it satisfies the constraints.
 
         This method advances the date until it matches the
         day-of-week and the day-of-month constraints.
 
-        Return False if the day meets contraints without modification.
-        Return True if self.dt was rolled forward.
+        Return None if the day meets contraints without modification.
+        Return the rolled forward datetime and the carry flag otherwise.
 
         """
 
-        needle = self.dt.date()
-        if self.match_dow(needle) and self.match_dom(needle):
-            return False
-
-        while not self.match_dow(needle) or not self.match_dom(needle):
-            needle += td(days=1)
-            if needle.day == 1:
-                # We're in a different month now, break out to re-check year and month
-                # This significantly speeds up the "0 0 * 2 MON#5" case
-                break
-
-        self.dt = datetime.combine(needle, time(), tzinfo=self.dt.tzinfo)
-        return True
-
-    def advance_month(self) -> bool:
+        year, month, day = dt.year, dt.month, dt.day
+        dow = dt.weekday()
+        # Fast path for the common case where the day already matches
+        if (self.days_pos_mask >> day) & 1 and (self.weekdays_mask >> dow) & 1:
+            return None
+
+        # Only visit the days that match the day-of-month constraint,
+        # and check the day-of-week constraint for each of them
+        days = self.days_by_length[days_in_month(year, month) - 28]
+        # The weekday of the (imaginary) day 0 of the month, 0 is Monday
+        offset = dow - day
+        for idx in range(bisect_left(days, day), len(days)):
+            candidate = days[idx]
+            if (self.weekdays_mask >> ((offset + candidate) % 7)) & 1:
+                if candidate == day:
+                    return None
+                # Note: the datetime constructor is much faster when tzinfo is
+                # passed as a positional argument rather than a keyword argument,
+                # so the datetime(...) calls in this and other advance_* methods
+                # do that.
+                moved = datetime(year, month, candidate, 0, 0, 0, 0, dt.tzinfo)
+                return Advance(moved, False)
+
+        # No matches left in this month, move to the next month,
+        # and let the caller re-check year and month
+        if month == 12:
+            return Advance(datetime(year + 1, 1, 1, 0, 0, 0, 0, dt.tzinfo), True)
+        return Advance(datetime(year, month + 1, 1, 0, 0, 0, 0, dt.tzinfo), True)
+
+    def advance_month(self, dt: datetime) -> Advance | None:
         """Roll forward the month component until it satisfies the constraints.
 
-        Return False if the month meets contraints without modification.
-        Return True if self.dt was rolled forward.
+        Return None if the month meets contraints without modification.
+        Return the rolled forward datetime and the carry flag otherwise.
 
         """
 
-        if self.dt.month in self.months:
-            return False
+        if (self.months_mask >> dt.month) & 1:
+            return None
 
-        needle = self.dt.date()
-        while needle.month not in self.months:
-            needle = (needle.replace(day=1) + td(days=32)).replace(day=1)
+        # Jump straight to the first matching month after the current one,
+        # or to the first matching month of the next year if there are none
+        idx = bisect_left(self.months_sorted, dt.month)
+        if idx < len(self.months_sorted):
+            month = self.months_sorted[idx]
+            return Advance(datetime(dt.year, month, 1, 0, 0, 0, 0, dt.tzinfo), False)
 
-        self.dt = datetime.combine(needle, time(), tzinfo=self.dt.tzinfo)
-        return True
+        month = self.months_sorted[0]
+        return Advance(datetime(dt.year + 1, month, 1, 0, 0, 0, 0, dt.tzinfo), True)
 
-    def advance_year(self) -> None:
+    def advance_year(self, dt: datetime) -> datetime:
         """Roll forward the year component until it satisfies the constraints.
 
-        Return False if the year meets contraints without modification.
-        Return True if self.dt was rolled forward.
+        Return the supplied datetime if the year meets contraints without
+        modification. Return the rolled forward datetime otherwise.
 
         """
 
-        if self.dt.year in self.years:
-            return
+        # Jump straight to the first matching year at or after the current one.
+        # If there are none, jump to MAX_YEAR, __next__ will stop iteration there.
+        idx = bisect_left(self.years_sorted, dt.year)
+        if idx == len(self.years_sorted):
+            return datetime(MAX_YEAR, 1, 1, 0, 0, 0, 0, dt.tzinfo)
 
-        needle = self.dt.date()
-        while needle.year not in self.years and needle.year < MAX_YEAR:
-            needle = needle.replace(year=needle.year + 1, month=1, day=1)
+        year = self.years_sorted[idx]
+        if year == dt.year:
+            return dt
 
-        self.dt = datetime.combine(needle, time(), tzinfo=self.dt.tzinfo)
+        return datetime(year, 1, 1, 0, 0, 0, 0, dt.tzinfo)
 
-    def __next__(self) -> datetime:
-        self.dt += SECOND
+    def is_imaginary(self, dt: datetime) -> bool:
+        """Return True if naive `dt` gets skipped over during DST transition.
 
+        `dt` must not be earlier than the datetime passed in the previous call.
+        """
+        assert self.fixup_tz
+        # DST gaps occur at most a few times a year. Look up the next one only
+        # after passing the end of the previous one, and otherwise
+        # just compare `dt` with the start of the gap.
+        if dt >= self.gap[1]:
+            self.gap = next_dst_gap(self.fixup_tz, dt)
+        return dt >= self.gap[0]
+
+    def next_fixed(self) -> datetime:
+        """Return the next match by adding the fixed interval to the previous one."""
+        assert self.fixed_step
+        dt = self.dt
         while True:
-            # print(f"{self.dt.isoformat()=}")
-            self.advance_year()
-
-            # systemd seems to generate dates up to 2200, so we do the same
-            if self.dt.year >= MAX_YEAR:
+            dt += self.fixed_step
+            if dt.year >= MAX_YEAR:
+                self.dt = dt
                 raise StopIteration
 
-            if self.advance_month():
-                continue
-
-            if self.advance_day():
-                continue
+            self.dt = dt
+            if self.fixup_tz:
+                if self.is_imaginary(dt):
+                    continue
+                return localize(dt, self.fixup_tz)
 
-            if self.advance_hour():
-                continue
+            return dt
 
-            if self.advance_minute():
-                continue
+    def __next__(self) -> datetime:
+        if self.fixed_step and self.matched:
+            return self.next_fixed()
+
+        # Work with local variables instead of attributes in the loop,
+        # and only store the final position back in self.dt
+        dt = self.dt + SECOND
+        fixup_tz = self.fixup_tz
+        advance_year = self.advance_year
+        steps = self.steps
+        num_steps = len(steps)
+        # The index of the next step to run. The fields checked by the steps
+        # before it are known to match, and 0 means the year needs
+        # re-checking too.
+        level = 0
 
-            if self.advance_second():
+        while True:
+            if level == 0:
+                dt = advance_year(dt)
+
+                # systemd seems to generate dates up to 2200, so we do the same
+                if dt.year >= MAX_YEAR:
+                    self.dt = dt
+                    raise StopIteration
+
+            if level < num_steps:
+                moved = steps[level](self, dt)
+                if moved is None:
+                    # This field matches, move on to the next smaller one
+                    level += 1
+                elif moved.carry:
+                    # Rolled over into a larger field, start over and
+                    # re-check all fields
+                    dt, level = moved.dt, 0
+                else:
+                    # Rolled forward within the same larger field, so only
+                    # the smaller fields need re-checking
+                    dt, level = moved.dt, level + 1
                 continue
 
-            if self.fixup_tz:
-                result = self.dt.replace(tzinfo=self.fixup_tz, fold=0)
-                if is_imaginary(result):
+            # All fields match
+            self.dt = dt
+            self.matched = True
+            if fixup_tz:
+                if self.is_imaginary(dt):
                     # If we hit an imaginary datetime then look for the next
                     # occurence
-                    self.dt += SECOND
+                    dt, level = dt + SECOND, 0
                     continue
-                return result
+                return localize(dt, fixup_tz)
 
-            return self.dt
+            return dt
 
 
+def looks_like_tz(value: str) -> bool:
+    """Return False if value cannot be a timezone name, without calling ZoneInfo."""
+    # Optimization: there are no timezones that start with a digit or star.
+    # This rejects the date and time components, which are the most common
+    # last components of expressions without a timezone.
+    if not value or value[0] in "0123456789*":
+        return False
+
+    # Skip the tzdata search for values that are not syntactically
+    # valid timezone names
+    return TZ_NAME_RE.fullmatch(value) is not None
+
+
+# The tz database has about 600 timezone names, make room for all of them
+@lru_cache(maxsize=1024)
 def parse_tz(value: str) -> ZoneInfo | None:
-    """Return ZoneInfo object or None if value fails to parse."""
-    # Optimization: there are no timezones that start with a digit or star
-    if value[0] in "0123456789*":
+    """Return ZoneInfo object or None if value fails to parse.
+
+    The results are cached. Besides skipping the ZoneInfo cache lookup,
+    this avoids repeating the failed tzdata search for values that are not
+    timezones, which ZoneInfo itself does not cache.
+    """
+    if not looks_like_tz(value):
         return None
 
     try:
@@ -485,6 +1014,8 @@ class TzIterator(object):
     timezone-aware.
     """
 
+    __slots__ = ("local_tz", "iterator", "__weakref__")
+
     def __init__(self, expression: str, start: datetime):
         """Initialize the iterator with an OnCalendar expression and the start time.
 
@@ -494,19 +1025,29 @@ class TzIterator(object):
         `start` is the timezone-aware datetime to start iteration from. The iterator
         will return datetimes using the same timezone as `start`.
         """
-        if not start.tzinfo:
+        if start.tzinfo is None:
             raise OnCalendarError("Argument 'dt' must be timezone-aware")
 
-        self.local_tz = start.tzinfo
+        # The timezone to convert the results to, or None if the results
+        # are already in the timezone of `start`
+        self.local_tz: tzinfo | None = None
         expression = expression.strip()
         if " " in expression:
             head, maybe_tz = expression.rsplit(maxsplit=1)
-            if tz := parse_tz(maybe_tz):
-                expression, start = head, start.astimezone(tz)
+            # Check looks_like_tz before parse_tz, so that date and time
+            # components do not take up space in the parse_tz cache
+            if looks_like_tz(maybe_tz) and (tz := parse_tz(maybe_tz)):
+                expression = head
+                if tz is not start.tzinfo:
+                    self.local_tz = start.tzinfo
+                    start = start.astimezone(tz)
 
         self.iterator = BaseIterator(expression, start)
 
     def __next__(self) -> datetime:
+        if self.local_tz is None:
+            return next(self.iterator)
+
         return next(self.iterator).astimezone(self.local_tz)
 
 
@@ -517,6 +1058,8 @@ class OnCalendar(object):
     expressions (separated by newlines) at once.
     """
 
+    __slots__ = ("dt", "heap", "__weakref__")
+
     def __init__(self, expressions: str, start: datetime):
         """Initialize the iterator with OnCalendar expression(s) and the start time.
 
@@ -527,26 +1070,92 @@ class OnCalendar(object):
         `start` is the timezone-aware datetime to start iteration from. The iterator
         will return datetimes using the same timezone as `start`.
         """
-        if not start.tzinfo:
+        if start.tzinfo is None:
             raise OnCalendarError("Argument 'dt' must be timezone-aware")
 
         self.dt = start
-        self.iterators = {}
-        for expr in expressions.strip().split("\n"):
-            self.iterators[TzIterator(expr, start.replace())] = start
+        # A heap of (next datetime, tie-breaker, iterator) entries. The tie-breaker
+        # keeps iterators with equal datetimes in the order they were added.
+        # All entries start with the same datetime, so the list is a valid heap.
+        self.heap: list[tuple[datetime, int, TzIterator]] = []
+        for idx, expr in enumerate(expressions.strip().split("\n")):
+            self.heap.append((start, idx, TzIterator(expr, start.replace())))
 
     def __next__(self) -> datetime:
-        for it in list(self.iterators.keys()):
-            if self.iterators[it] > self.dt:
-                continue
-
+        # Advance every iterator that has caught up with self.dt. Advance each
+        # of them only once, and only push them back on the heap afterwards,
+        # so that repeated datetimes during DST transitions are not skipped.
+        advanced = []
+        while self.heap and self.heap[0][0] <= self.dt:
+            _, idx, it = heappop(self.heap)
             try:
-                self.iterators[it] = next(it)
+                advanced.append((next(it), idx, it))
             except StopIteration:
-                del self.iterators[it]
+                pass
+
+        for item in advanced:
+            heappush(self.heap, item)
 
-        if not self.iterators:
+        if not self.heap:
             raise StopIteration
 
-        self.dt = min(self.iterators.values())
+        self.dt = self.heap[0][0]
         return self.dt
+
+
+def next_fire(expressions: str, start: datetime) -> datetime | None:
+    """Return the first datetime after `start` that matches `expressions`.
+
+    `expressions` and `start` have the same meaning as in `OnCalendar`. Return None
+    if there are no matches before year 2200.
+
+    The results are cached, so repeated queries with the same expressions
+    and the same start time (truncated to whole seconds) are cheap.
+    """
+    if start.tzinfo is None:
+        raise OnCalendarError("Argument 'dt' must be timezone-aware")
+
+    start = start.replace(microsecond=0)
+    # Aware datetimes that represent the same instant compare equal regardless
+    # of their timezone, and datetimes in the same timezone compare equal
+    # regardless of their fold. The results depend on both (the timezone
+    # of the results, and the instant a repeated wall clock time refers to),
+    # so pass them along to make them a part of the cache key.
+    return cached_next_fire(expressions, start, start.tzinfo, start.fold)
+
+
+@lru_cache(maxsize=4096)
+def cached_next_fire(
+    expressions: str, start: datetime, tz: tzinfo, fold: int
+) -> datetime | None:
+    """Return the first match of `expressions` after `start`, see `next_fire`."""
+    try:
+        return next(OnCalendar(expressions, start))
+    except StopIteration:
+        return None
+
+
+def fires_between(expressions: str, start: datetime, end: datetime) -> list[datetime]:
+    """Return all datetimes after `start` and up to `end` that match `expressions`.
+
+    `expressions` and `start` have the same meaning as in `OnCalendar`. `end` is
+    inclusive.
+    """
+    if end.tzinfo is None:
+        raise OnCalendarError("Argument 'end' must be timezone-aware")
+
+    # Datetimes in the same timezone are compared by wall clock time, ignoring
+    # fold, which gives wrong results during the repeated hour of a DST
+    # transition. Compare in UTC instead.
+    end = end.astimezone(UTC)
+    # Call the bound __next__ method directly in the loop, and handle
+    # StopIteration only once at the end
+    advance = OnCalendar(expressions, start).__next__
+    result = []
+    try:
+        while (dt := advance()).astimezone(UTC) <= end:
+            result.append(dt)
+    except StopIteration:
+        pass
+
+    return result
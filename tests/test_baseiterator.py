@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 import unittest
-from datetime import datetime
+from datetime import date, datetime, timedelta, tzinfo
 from itertools import product
 from zoneinfo import ZoneInfo
 
-from oncalendar import BaseIterator, OnCalendarError
+from oncalendar import BaseIterator, OnCalendarError, is_imaginary
 
 NOW = datetime(2020, 1, 1)
 
@@ -141,6 +141,15 @@ class TestParse(unittest.TestCase):
         w = BaseIterator("*-*~3/2", NOW)
         self.assertEqual(w.days, {-1, -3})
 
+    def test_it_matches_days(self) -> None:
+        w = BaseIterator("Mon *-*~1", NOW)
+        self.assertTrue(w.any_reverse_day)
+        self.assertTrue(w.match_dom(date(2020, 2, 29)))
+        self.assertFalse(w.match_dom(date(2020, 2, 28)))
+        self.assertTrue(w.match_dom(date(2021, 2, 28)))
+        self.assertTrue(w.match_dow(date(2020, 1, 6)))
+        self.assertFalse(w.match_dow(date(2020, 1, 7)))
+
     def test_it_parses_special_expression(self) -> None:
         for sample in ("minutely", "Minutely", "MINUTELY", "MiNuTeLY"):
             w = BaseIterator(sample, NOW)
@@ -149,6 +158,15 @@ class TestParse(unittest.TestCase):
             self.assertEqual(w.minutes, set(range(0, 60)))
             self.assertEqual(w.seconds, {0})
 
+    def test_it_shares_parsed_fields(self) -> None:
+        w1 = BaseIterator("Mon *-*-1..7 *:0/15", NOW)
+        w2 = BaseIterator("Mon *-*-1..7 *:0/15", NOW)
+        self.assertIs(w1.days, w2.days)
+        self.assertIs(w1.minutes, w2.minutes)
+        self.assertIsInstance(w1.minutes, frozenset)
+        self.assertIs(w1.next_minute, w2.next_minute)
+        self.assertIs(w1.days_by_length, w2.days_by_length)
+
 
 class TestValidation(unittest.TestCase):
     def test_it_rejects_empty_string(self) -> None:
@@ -196,6 +214,10 @@ class TestValidation(unittest.TestCase):
         with self.assertRaisesRegex(OnCalendarError, "Bad minute"):
             BaseIterator("*:1..1_0", NOW)
 
+    def test_it_rejects_non_ascii_digits(self) -> None:
+        with self.assertRaisesRegex(OnCalendarError, "Bad minute"):
+            BaseIterator("*:\u0661", NOW)
+
     def test_it_rejects_zero_step(self) -> None:
         with self.assertRaisesRegex(OnCalendarError, "Bad minute"):
             BaseIterator("*:*/0", NOW)
@@ -219,6 +241,28 @@ class TestIterator(unittest.TestCase):
         self.assertEqual(next(it).isoformat(), "2020-01-01T00:00:05")
         self.assertEqual(next(it).isoformat(), "2020-01-01T00:00:10")
 
+    def test_it_handles_seconds_across_minute_boundary(self) -> None:
+        it = BaseIterator("*:*:30,45", NOW.replace(second=50))
+        self.assertEqual(next(it).isoformat(), "2020-01-01T00:01:30")
+        self.assertEqual(next(it).isoformat(), "2020-01-01T00:01:45")
+
+    def test_it_handles_hours_across_day_boundary(self) -> None:
+        it = BaseIterator("8,20:00", NOW.replace(hour=21))
+        self.assertEqual(next(it).isoformat(), "2020-01-02T08:00:00")
+        self.assertEqual(next(it).isoformat(), "2020-01-02T20:00:00")
+
+    def test_it_handles_many_times_of_day(self) -> None:
+        # 12 * 60 * 30 matching times of day, more than fit in times_of_day
+        it = BaseIterator("0/2:*:1/2", NOW.replace(hour=21, minute=59, second=58))
+        self.assertEqual(next(it).isoformat(), "2020-01-01T22:00:01")
+        self.assertEqual(next(it).isoformat(), "2020-01-01T22:00:03")
+
+    def test_it_handles_fixed_interval(self) -> None:
+        it = BaseIterator("0/6:00", NOW.replace(hour=13))
+        self.assertEqual(next(it).isoformat(), "2020-01-01T18:00:00")
+        self.assertEqual(next(it).isoformat(), "2020-01-02T00:00:00")
+        self.assertEqual(next(it).isoformat(), "2020-01-02T06:00:00")
+
     def test_it_handles_every_minute(self) -> None:
         it = BaseIterator("*:*", NOW)
         self.assertEqual(next(it).isoformat(), "2020-01-01T00:01:00")
@@ -241,6 +285,24 @@ class TestIterator(unittest.TestCase):
         self.assertEqual(next(it).isoformat(), "2020-02-23T00:00:00")
         self.assertEqual(next(it).isoformat(), "2020-03-29T00:00:00")
 
+    def test_it_handles_sparse_years(self) -> None:
+        it = BaseIterator("2019,2030,2150-01-01", NOW)
+        self.assertEqual(next(it).isoformat(), "2030-01-01T00:00:00")
+        self.assertEqual(next(it).isoformat(), "2150-01-01T00:00:00")
+        with self.assertRaises(StopIteration):
+            next(it)
+
+    def test_it_skips_months_without_matching_days(self) -> None:
+        it = BaseIterator("*-*-31", NOW.replace(month=3, day=31, hour=1))
+        self.assertEqual(next(it).isoformat(), "2020-05-31T00:00:00")
+        self.assertEqual(next(it).isoformat(), "2020-07-31T00:00:00")
+        self.assertEqual(next(it).isoformat(), "2020-08-31T00:00:00")
+
+    def test_it_handles_impossible_date(self) -> None:
+        it = BaseIterator("*-02-30", NOW)
+        with self.assertRaises(StopIteration):
+            next(it)
+
     def test_it_handles_no_occurences(self) -> None:
         it = BaseIterator("2019-01-01", NOW)
         with self.assertRaises(StopIteration):
@@ -251,6 +313,42 @@ class TestIterator(unittest.TestCase):
         self.assertEqual(next(it).isoformat(), "2020-01-02T00:00:00")
 
 
+class YearEndTz(tzinfo):
+    """A timezone that moves from UTC-5 to UTC-4 at 2025-01-01 03:00 UTC.
+
+    The skipped wall clock times are 2024-12-31 22:00 to 23:00.
+    """
+
+    transition = datetime(2025, 1, 1, 3)
+
+    def utcoffset(self, dt: datetime | None) -> timedelta:
+        assert dt
+        naive = dt.replace(tzinfo=None)
+        if naive < self.transition - timedelta(hours=5 - dt.fold):
+            return timedelta(hours=-5)
+        return timedelta(hours=-4)
+
+    def dst(self, dt: datetime | None) -> timedelta:
+        return timedelta(0)
+
+    def tzname(self, dt: datetime | None) -> str:
+        return "YearEnd"
+
+    def fromutc(self, dt: datetime) -> datetime:
+        naive = dt.replace(tzinfo=None)
+        hours = -5 if naive < self.transition else -4
+        return (naive + timedelta(hours=hours)).replace(tzinfo=self)
+
+
+class YearStartTz(YearEndTz):
+    """A timezone that moves from UTC-5 to UTC-4 at 2025-01-01 04:30 UTC.
+
+    The skipped wall clock times are 2024-12-31 23:30 to 2025-01-01 00:30.
+    """
+
+    transition = datetime(2025, 1, 1, 4, 30)
+
+
 class TestDstHandling(unittest.TestCase):
     tz = ZoneInfo("Europe/Riga")
 
@@ -269,6 +367,47 @@ class TestDstHandling(unittest.TestCase):
         self.assertEqual(next(it).isoformat(), "2020-02-29T03:30:00+02:00")
         self.assertEqual(next(it).isoformat(), "2020-04-29T03:30:00+03:00")
 
+    def test_it_handles_spring_dst_with_fixed_interval(self) -> None:
+        now = datetime(2020, 3, 29, 1, 30, tzinfo=self.tz)
+
+        it = BaseIterator("hourly", now)
+        self.assertEqual(next(it).isoformat(), "2020-03-29T02:00:00+02:00")
+        self.assertEqual(next(it).isoformat(), "2020-03-29T04:00:00+03:00")
+        self.assertEqual(next(it).isoformat(), "2020-03-29T05:00:00+03:00")
+
+    def test_it_handles_spring_dst_in_consecutive_years(self) -> None:
+        now = datetime(2020, 1, 1, tzinfo=self.tz)
+
+        it = BaseIterator("*-03-28,29 3:30", now)
+        self.assertEqual(next(it).isoformat(), "2020-03-28T03:30:00+02:00")
+        # 2020-03-29 03:30 and 2021-03-28 03:30 get skipped over
+        self.assertEqual(next(it).isoformat(), "2021-03-29T03:30:00+03:00")
+        self.assertEqual(next(it).isoformat(), "2022-03-28T03:30:00+03:00")
+
+    def test_it_handles_spring_dst_at_year_end(self) -> None:
+        now = datetime(2024, 6, 1, tzinfo=YearEndTz())
+
+        it = BaseIterator("*-12-31 22:30", now)
+        self.assertEqual(next(it).isoformat(), "2025-12-31T22:30:00-04:00")
+
+    def test_it_handles_spring_dst_at_year_start(self) -> None:
+        now = datetime(2025, 1, 1, tzinfo=YearStartTz())
+
+        it = BaseIterator("*:0/10", now)
+        self.assertEqual(next(it).isoformat(), "2025-01-01T00:30:00-04:00")
+        self.assertEqual(next(it).isoformat(), "2025-01-01T00:40:00-04:00")
+
+        now = datetime(2024, 12, 31, 23, 10, tzinfo=YearStartTz())
+
+        it = BaseIterator("*:0/10", now)
+        self.assertEqual(next(it).isoformat(), "2024-12-31T23:20:00-05:00")
+        self.assertEqual(next(it).isoformat(), "2025-01-01T00:30:00-04:00")
+
+    def test_is_imaginary_works(self) -> None:
+        self.assertTrue(is_imaginary(datetime(2020, 3, 29, 3, 30, tzinfo=self.tz)))
+        self.assertFalse(is_imaginary(datetime(2020, 3, 29, 4, 30, tzinfo=self.tz)))
+        self.assertFalse(is_imaginary(datetime(2020, 10, 25, 3, 30, tzinfo=self.tz)))
+
     def test_it_handles_autumn_dst(self) -> None:
         now = datetime(2020, 10, 1, tzinfo=self.tz)
 
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import unittest
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+from oncalendar import OnCalendarError, fires_between
+
+
+class TestFiresBetween(unittest.TestCase):
+    tz = ZoneInfo("Europe/Riga")
+
+    def test_it_works(self) -> None:
+        start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        end = datetime(2020, 1, 2, 12, 34, tzinfo=timezone.utc)
+        result = fires_between("00:00\n12:34", start, end)
+        self.assertEqual(
+            [dt.isoformat() for dt in result],
+            [
+                "2020-01-01T12:34:00+00:00",
+                "2020-01-02T00:00:00+00:00",
+                "2020-01-02T12:34:00+00:00",
+            ],
+        )
+
+    def test_it_handles_empty_window(self) -> None:
+        start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        end = datetime(2020, 1, 1, 12, tzinfo=timezone.utc)
+        self.assertEqual(fires_between("12:34", start, end), [])
+
+    def test_it_handles_stopiteration(self) -> None:
+        start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        end = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        result = fires_between("2020-01-02", start, end)
+        self.assertEqual(
+            [dt.isoformat() for dt in result], ["2020-01-02T00:00:00+00:00"]
+        )
+
+    def test_it_handles_timezone(self) -> None:
+        start = datetime(2020, 10, 25, 2, 30, tzinfo=self.tz)
+        end = datetime(2020, 10, 25, 5, tzinfo=self.tz)
+        result = fires_between("*:00,30", start, end)
+        self.assertEqual(
+            [dt.isoformat() for dt in result],
+            [
+                "2020-10-25T03:00:00+03:00",
+                "2020-10-25T03:30:00+03:00",
+                "2020-10-25T04:00:00+02:00",
+                "2020-10-25T04:30:00+02:00",
+                "2020-10-25T05:00:00+02:00",
+            ],
+        )
+
+    def test_it_handles_end_in_repeated_hour(self) -> None:
+        start = datetime(2020, 10, 25, 2, 30, tzinfo=self.tz)
+        # The first 03:45, before the clocks go back
+        end = datetime(2020, 10, 25, 3, 45, tzinfo=self.tz)
+        result = fires_between("*:00,30 UTC", start, end)
+        self.assertEqual(
+            [dt.isoformat() for dt in result],
+            ["2020-10-25T03:00:00+03:00", "2020-10-25T03:30:00+03:00"],
+        )
+
+        # The second 03:15, after the clocks go back
+        end = datetime(2020, 10, 25, 3, 15, tzinfo=self.tz, fold=1)
+        result = fires_between("*:00,30 UTC", start, end)
+        self.assertEqual(
+            [dt.isoformat() for dt in result],
+            [
+                "2020-10-25T03:00:00+03:00",
+                "2020-10-25T03:30:00+03:00",
+                "2020-10-25T03:00:00+02:00",
+            ],
+        )
+
+    def test_it_requires_aware_datetime(self) -> None:
+        with self.assertRaises(OnCalendarError):
+            fires_between("12:34", datetime(2020, 1, 1), datetime(2020, 1, 2))
+
+    def test_it_requires_aware_end(self) -> None:
+        start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        with self.assertRaises(OnCalendarError):
+            fires_between("12:34", start, datetime(2020, 1, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import unittest
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+from oncalendar import OnCalendarError, next_fire
+
+
+class TestNextFire(unittest.TestCase):
+    tz = ZoneInfo("Europe/Riga")
+
+    def test_it_works(self) -> None:
+        now = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        result = next_fire("00:00\n12:34 Europe/Riga", now)
+        assert result
+        self.assertEqual(result.isoformat(), "2020-01-01T10:34:00+00:00")
+
+    def test_it_ignores_microseconds(self) -> None:
+        now = datetime(2020, 1, 1, 12, 34, 0, 500000, tzinfo=timezone.utc)
+        result = next_fire("12:34", now)
+        assert result
+        self.assertEqual(result.isoformat(), "2020-01-02T12:34:00+00:00")
+
+    def test_it_preserves_timezone(self) -> None:
+        now = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        result = next_fire("12:34", now)
+        assert result
+        self.assertEqual(result.isoformat(), "2020-01-01T12:34:00+00:00")
+
+        # The same instant in a different timezone must not hit the cache entry
+        result = next_fire("12:34", now.astimezone(self.tz))
+        assert result
+        self.assertEqual(result.isoformat(), "2020-01-01T12:34:00+02:00")
+
+    def test_it_handles_fold(self) -> None:
+        # 03:30 happens twice on 2020-10-25 in Europe/Riga
+        now = datetime(2020, 10, 25, 3, 30, tzinfo=self.tz)
+        result = next_fire("*:00 UTC", now)
+        assert result
+        self.assertEqual(result.isoformat(), "2020-10-25T03:00:00+02:00")
+
+        # The second 03:30 compares equal to the first one, but must not
+        # hit the cache entry
+        result = next_fire("*:00 UTC", now.replace(fold=1))
+        assert result
+        self.assertEqual(result.isoformat(), "2020-10-25T04:00:00+02:00")
+
+    def test_it_handles_no_occurences(self) -> None:
+        now = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        self.assertIsNone(next_fire("2019-01-01", now))
+
+    def test_it_requires_aware_datetime(self) -> None:
+        with self.assertRaises(OnCalendarError):
+            next_fire("12:34", datetime(2020, 1, 1))
+
+    def test_it_rejects_bad_expression(self) -> None:
+        now = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        with self.assertRaisesRegex(OnCalendarError, "Bad hour"):
+            next_fire("123:456", now)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import unittest
+import weakref
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
 
@@ -18,6 +19,13 @@ class TestTzIterator(unittest.TestCase):
         self.assertEqual(next(it).isoformat(), "2020-01-02T12:34:00+00:00")
         self.assertEqual(next(it).isoformat(), "2020-01-03T00:00:00+00:00")
 
+    def test_it_handles_duplicate_expressions(self) -> None:
+        now = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        it = OnCalendar("12:34\n00:00\n12:34", now)
+        self.assertEqual(next(it).isoformat(), "2020-01-01T12:34:00+00:00")
+        self.assertEqual(next(it).isoformat(), "2020-01-02T00:00:00+00:00")
+        self.assertEqual(next(it).isoformat(), "2020-01-02T12:34:00+00:00")
+
     def test_it_requires_aware_datetime(self) -> None:
         now = datetime(2020, 1, 1)
         with self.assertRaises(OnCalendarError):
@@ -37,6 +45,11 @@ class TestTzIterator(unittest.TestCase):
         with self.assertRaises(StopIteration):
             print(next(it))
 
+    def test_it_supports_weak_references(self) -> None:
+        now = datetime(2020, 1, 1, tzinfo=self.tz)
+        it = OnCalendar("12:34", now)
+        self.assertIs(weakref.ref(it)(), it)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -5,7 +5,7 @@ from datetime import datetime, timezone
 from unittest.mock import patch
 from zoneinfo import ZoneInfo
 
-from oncalendar import OnCalendarError, TzIterator
+from oncalendar import OnCalendarError, TzIterator, parse_tz
 
 NOW = datetime(2020, 1, 1, tzinfo=timezone.utc)
 
@@ -46,12 +46,29 @@ class TestTzIterator(unittest.TestCase):
             "*-* *:*",  # no timezone contains ":"
             "Mon 1-10",  # no timezone starts with a digit
             "Mon *-10",  # no timezone starts with a star
+            "Mon 12:34",
+            "2020-01-01 12:34:56",
         )
         for sample in samples:
             with patch("oncalendar.ZoneInfo", return_value=None) as mock:
                 TzIterator(sample, NOW)
                 self.assertFalse(mock.called)
 
+    def test_it_avoids_zoneinfo_inits_for_malformed_names(self) -> None:
+        for sample in ("12:34 Europe/Riga!", "12:34 Europe//Riga", "12:34 Riga/"):
+            with patch("oncalendar.ZoneInfo") as mock:
+                with self.assertRaises(OnCalendarError):
+                    TzIterator(sample, NOW)
+                self.assertFalse(mock.called)
+
+    def test_it_caches_failed_timezone_lookups(self) -> None:
+        parse_tz.cache_clear()
+        with patch("oncalendar.ZoneInfo", side_effect=ValueError) as mock:
+            for _ in range(2):
+                with self.assertRaises(OnCalendarError):
+                    TzIterator("12:34 Europe/Nowhere", NOW)
+            self.assertEqual(mock.call_count, 1)
+
 
 class TestValidation(unittest.TestCase):
     def test_it_rejects_lone_timezone(self) -> None: